@@ -0,0 +1,265 @@
+"""
+Shared helpers for the MCP build scripts.
+Bundle metadata and copy routines used by the installer build scripts.
+"""
+
+import base64
+import ctypes
+import ctypes.util
+import functools
+import hashlib
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Persistent pip cache shared across builds so wheels are only fetched once
+PIP_CACHE_DIR = Path.home() / ".cache" / "mcp_pip_build"
+
+# Info.plist for the MCP.app bundle, embedded as a pre-serialized binary plist:
+#   CFBundleName: 'MCP'
+#   CFBundleDisplayName: 'MCP Control Panel'
+#   CFBundleIdentifier: 'com.mcp.controlpanel'
+#   CFBundleVersion: '1.0.0'
+#   CFBundleShortVersionString: '1.0.0'
+#   CFBundleExecutable: 'MCP'
+#   CFBundleIconFile: 'MCP.icns'
+#   LSApplicationCategoryType: 'public.app-category.developer-tools'
+#   NSHighResolutionCapable: True
+#   LSMinimumSystemVersion: '10.14'
+#   NSRequiresAquaSystemAppearance: False
+#   LSUIElement: False
+# Regenerate with base64.b64encode(plistlib.dumps(info, fmt=plistlib.FMT_BINARY))
+INFO_PLIST_BIN = base64.b64decode(
+    "YnBsaXN0MDDcAQIDBAUGBwgJCgsMDQ4PEA4RERITFBUUXxATQ0ZCdW5kbGVEaXNwbGF5TmFt"
+    "ZV8QEkNGQnVuZGxlRXhlY3V0YWJsZV8QEENGQnVuZGxlSWNvbkZpbGVfEBJDRkJ1bmRsZUlk"
+    "ZW50aWZpZXJcQ0ZCdW5kbGVOYW1lXxAaQ0ZCdW5kbGVTaG9ydFZlcnNpb25TdHJpbmdfEA9D"
+    "RkJ1bmRsZVZlcnNpb25fEBlMU0FwcGxpY2F0aW9uQ2F0ZWdvcnlUeXBlXxAWTFNNaW5pbXVt"
+    "U3lzdGVtVmVyc2lvbltMU1VJRWxlbWVudF8QF05TSGlnaFJlc29sdXRpb25DYXBhYmxlXxAe"
+    "TlNSZXF1aXJlc0FxdWFTeXN0ZW1BcHBlYXJhbmNlXxARTUNQIENvbnRyb2wgUGFuZWxTTUNQ"
+    "WE1DUC5pY25zXxAUY29tLm1jcC5jb250cm9scGFuZWxVMS4wLjBfECNwdWJsaWMuYXBwLWNh"
+    "dGVnb3J5LmRldmVsb3Blci10b29sc1UxMC4xNAgJAAgAIQA3AEwAXwB0AIEAngCwAMwA5QDx"
+    "AQsBLAFAAUQBTQFkAWoBkAGWAZcAAAAAAAACAQAAAAAAAAAWAAAAAAAAAAAAAAAAAAABmA=="
+)
+
+@functools.cache
+def _load_clonefile():
+    """Resolve clonefile(2) from libSystem once; None where it isn't available."""
+    library = ctypes.util.find_library("System")
+    if not library:
+        return None
+    try:
+        clonefile = ctypes.CDLL(library, use_errno=True).clonefile
+    except (OSError, AttributeError):
+        return None
+    clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+    clonefile.restype = ctypes.c_int
+    return clonefile
+
+def _clonefile(src, dst):
+    """Clone src to dst with clonefile(2); return False if it isn't available."""
+    clonefile = _load_clonefile()
+    if clonefile is None:
+        return False
+    return clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0
+
+def apfs_clone(src, dst):
+    """Clone src to dst with clonefile(2), falling back to a regular copy.
+    
+    On APFS the clone is copy-on-write, so no data is duplicated until one
+    side is modified. Other platforms and cross-volume copies fall back to
+    shutil.
+    """
+    if _clonefile(src, dst):
+        return
+    
+    if os.path.isdir(src):
+        shutil.copytree(src, dst, symlinks=True)
+    else:
+        shutil.copy2(src, dst)
+
+def fast_copy(src, dst):
+    """Copy a single file, cloning it on APFS and using sendfile(2) elsewhere.
+    
+    Falls back to shutil.copy2 where neither works; macOS only supports
+    sendfile(2) to sockets.
+    """
+    if _clonefile(src, dst):
+        return
+    
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            offset = 0
+            while True:
+                sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, 1 << 20)
+                if sent == 0:
+                    break
+                offset += sent
+        shutil.copystat(src, dst)
+    except (AttributeError, OSError):
+        shutil.copy2(src, dst)
+
+def fast_copytree(src, dst):
+    """Copy a directory tree with `cp -cR` so APFS clones each file.
+    
+    Falls back to shutil.copytree where `cp -c` is unsupported.
+    """
+    try:
+        result = subprocess.run(["cp", "-cR", str(src), str(dst)], capture_output=True)
+        if result.returncode == 0:
+            return
+    except OSError:
+        pass
+    
+    if os.path.exists(dst):
+        shutil.rmtree(dst)
+    shutil.copytree(src, dst, symlinks=True)
+
+def remove_paths(paths):
+    """Delete files and directory trees with a single `rm -rf`.
+    
+    Falls back to shutil where `rm` isn't available.
+    """
+    if not paths:
+        return
+    if shutil.which("rm"):
+        subprocess.run(["rm", "-rf", "--", *map(str, paths)], check=True)
+        return
+    
+    for path in paths:
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+
+def write_bundle_files(entries, contents_path, macos_path, resources_path, main_executable_src):
+    """Write Info.plist, the launcher and the application files into the bundle.
+    
+    entries is a name -> DirEntry snapshot of the project directory. The files
+    are written concurrently; any failure is re-raised.
+    """
+    def write_main_executable():
+        main_exec_path = macos_path / "MCP"
+        main_exec_path.write_text(main_executable_src)
+        os.chmod(main_exec_path, 0o755)
+    
+    with ThreadPoolExecutor() as executor:
+        bundle_tasks = [
+            executor.submit((contents_path / "Info.plist").write_bytes, INFO_PLIST_BIN),
+            executor.submit(write_main_executable)
+        ]
+        
+        # Copy icon
+        if "MCP.icns" in entries:
+            print("🎨 Adding application icon...")
+            bundle_tasks.append(executor.submit(fast_copy, "MCP.icns", resources_path / "MCP.icns"))
+        
+        # Copy application files
+        for item in ["src", "config"]:
+            if item in entries:
+                if entries[item].is_dir():
+                    bundle_tasks.append(executor.submit(fast_copytree, item, macos_path / item))
+        
+        # Copy launch.py, plus requirements.txt for reference
+        for item in ["launch.py", "requirements.txt"]:
+            if item in entries:
+                bundle_tasks.append(executor.submit(fast_copy, item, macos_path / item))
+        
+        # Re-raise any failure from the bundle tasks
+        for task in bundle_tasks:
+            task.result()
+
+def maybe_upgrade_pip(pip_cmd, env):
+    """Upgrade pip in a fresh venv only when MCP_UPGRADE_PIP is set.
+    
+    The venv's bundled pip is recent enough for the pinned dependencies.
+    """
+    if os.environ.get("MCP_UPGRADE_PIP"):
+        subprocess.run([*map(str, pip_cmd), "install", "--upgrade", "--quiet", "pip"],
+                       check=True, env={**env, "PIP_DISABLE_PIP_VERSION_CHECK": "1"})
+
+def precompile(python, lib_dir):
+    """Byte-compile lib_dir on every core so first launch doesn't pay for it.
+    
+    Hash-based pycs stay valid however the bundle's mtimes change when copied.
+    """
+    subprocess.run([str(python), "-m", "compileall", "-q", "-j", "0",
+                    "--invalidation-mode", "unchecked-hash", str(lib_dir)], check=False)
+
+def _format_rejected(stderr):
+    """Check whether hdiutil failed because it doesn't know the image format."""
+    message = stderr.lower()
+    return "ulfo" in message or (
+        "format" in message
+        and any(word in message for word in ("unknown", "invalid", "unsupported", "not recognized"))
+    )
+
+def create_dmg(src_folder, volname, dmg_name):
+    """Create a compressed DMG of src_folder with hdiutil.
+    
+    Uses LZFSE (ULFO) and falls back to zlib (UDZO) where hdiutil rejects
+    that format; other failures are returned as-is. Returns the completed
+    hdiutil process.
+    """
+    create_dmg_cmd = [
+        "hdiutil", "create",
+        "-srcfolder", str(src_folder),
+        "-volname", volname,
+        "-fs", "HFS+",
+        "-fsargs", "-c c=64,a=16,e=16",
+        "-format", "ULFO",
+        dmg_name
+    ]
+    
+    result = subprocess.run(create_dmg_cmd, capture_output=True, text=True)
+    if result.returncode != 0 and _format_rejected(result.stderr):
+        print("⚠️  ULFO format unavailable, falling back to UDZO...")
+        if os.path.exists(dmg_name):
+            os.remove(dmg_name)
+        create_dmg_cmd[create_dmg_cmd.index("ULFO")] = "UDZO"
+        result = subprocess.run(create_dmg_cmd, capture_output=True, text=True)
+    return result
+
+def cached_venv(cache_root, python, key_parts, install):
+    """Create a venv under cache_root with python, or reuse it if still current.
+    
+    The venv is keyed on the resolved interpreter path plus key_parts, so it is
+    only rebuilt when one of them changes. install(venv_path) populates a new
+    venv and returns whether everything was installed; only then is the venv
+    marked reusable.
+    """
+    interpreter = os.path.realpath(shutil.which(str(python)) or python)
+    key = hashlib.blake2b("\n".join([interpreter, *key_parts]).encode()).hexdigest()
+    venv_path = cache_root / "venv"
+    key_path = cache_root / "venv.key"
+    if venv_path.exists() and key_path.exists() and key_path.read_text() == key:
+        print("♻️  Reusing cached virtual environment...")
+        return venv_path
+    
+    if venv_path.exists():
+        shutil.rmtree(venv_path)
+    if key_path.exists():
+        key_path.unlink()
+    cache_root.mkdir(parents=True, exist_ok=True)
+    subprocess.run([str(python), "-m", "venv", str(venv_path)], check=True)
+    
+    if install(venv_path):
+        key_path.write_text(key)
+    return venv_path
+
+def clone_venv(reference_venv, venv_path):
+    """Clone the reference venv to venv_path and repoint its absolute paths."""
+    fast_copytree(reference_venv, venv_path)
+    
+    # Console-script shebangs and pyvenv.cfg embed the venv's own location
+    old, new = str(reference_venv.resolve()), str(venv_path.resolve())
+    for path in [*(venv_path / "bin").iterdir(), venv_path / "pyvenv.cfg"]:
+        if path.is_symlink() or not path.is_file():
+            continue
+        try:
+            content = path.read_text()
+        except UnicodeDecodeError:
+            continue
+        if old in content:
+            path.write_text(content.replace(old, new))
@@ -4,136 +4,46 @@ MCP Final Professional Installer - Python 3.12 with Fixed Dependencies
 Creates a bulletproof .dmg installer that actually works.
 """
 
+import filecmp
 import os
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-def create_final_dmg():
-    """Create the final working DMG installer."""
-    
-    print("🚀 Creating MCP Final Professional Installer (Python 3.12)...")
-    
-    # Clean up any existing builds
-    build_items = ["MCP.app", "MCP_Professional_Installer.dmg", "MCP_Final_Installer.dmg", "dmg_temp", "dist"]
-    for item in build_items:
-        if os.path.exists(item):
-            print(f"🧹 Cleaning up {item}...")
-            if os.path.isdir(item):
-                shutil.rmtree(item)
-            else:
-                os.remove(item)
-    
-    # Create distribution directory
-    dist_path = Path("dist")
-    dist_path.mkdir(exist_ok=True)
-    
-    print("📦 Building MCP Application Bundle (Python 3.12)...")
-    
-    # Create app bundle structure
-    app_path = dist_path / "MCP.app"
-    contents_path = app_path / "Contents"
-    macos_path = contents_path / "MacOS"
-    resources_path = contents_path / "Resources"
-    
-    # Create directories
-    macos_path.mkdir(parents=True, exist_ok=True)
-    resources_path.mkdir(parents=True, exist_ok=True)
-    
-    # Create Info.plist
-    info_plist = {
-        'CFBundleName': 'MCP',
-        'CFBundleDisplayName': 'MCP Control Panel',
-        'CFBundleIdentifier': 'com.mcp.controlpanel',
-        'CFBundleVersion': '1.0.0',
-        'CFBundleShortVersionString': '1.0.0',
-        'CFBundleExecutable': 'MCP',
-        'CFBundleIconFile': 'MCP.icns',
-        'LSApplicationCategoryType': 'public.app-category.developer-tools',
-        'NSHighResolutionCapable': True,
-        'LSMinimumSystemVersion': '10.14',
-        'NSRequiresAquaSystemAppearance': False,
-        'LSUIElement': False
-    }
-    
-    import plistlib
-    with open(contents_path / "Info.plist", 'wb') as f:
-        plistlib.dump(info_plist, f)
-    
-    # Copy icon
-    if os.path.exists("MCP.icns"):
-        print("🎨 Adding application icon...")
-        shutil.copy2("MCP.icns", resources_path / "MCP.icns")
-    
-    # Force Python 3.12 usage
-    print("🐍 Creating virtual environment with Python 3.12...")
-    python_executables = [
-        "/usr/bin/python3.12",
-        "/usr/local/bin/python3.12", 
-        "/opt/homebrew/bin/python3.12",
-        "/Library/Frameworks/Python.framework/Versions/3.12/bin/python3.12",
-        "python3.12",
-        "python3"
-    ]
-    
-    python_cmd = None
-    for cmd in python_executables:
-        try:
-            result = subprocess.run([cmd, "--version"], capture_output=True, text=True)
-            if result.returncode == 0 and "3.12" in result.stdout:
-                python_cmd = cmd
-                print(f"✅ Found Python 3.12: {cmd}")
-                break
-        except:
-            continue
-    
-    if not python_cmd:
-        print("❌ Python 3.12 not found! Please install Python 3.12")
-        return False
-    
-    # Create virtual environment with Python 3.12
-    venv_path = macos_path / "venv"
-    subprocess.run([python_cmd, "-m", "venv", str(venv_path)], check=True)
-    
-    # Install dependencies with proper paths
-    print("📦 Installing dependencies with Python 3.12...")
-    pip_path = venv_path / "bin" / "pip"
-    python_venv = venv_path / "bin" / "python"
-    
-    # Upgrade pip first
-    subprocess.run([str(python_venv), "-m", "pip", "install", "--upgrade", "pip"], check=True)
-    
-    # Install dependencies one by one to catch issues
-    dependencies = [
-        "fastapi==0.104.1",
-        "uvicorn==0.24.0",
-        "pydantic==2.4.2", 
-        "pydantic-settings==2.1.0",
-        "python-dotenv==1.0.0",
-        "pyyaml==6.0.1",
-        "loguru==0.7.2",
-        "python-jose[cryptography]==3.3.0",
-        "passlib[bcrypt]==1.7.4",
-        "python-multipart==0.0.6",
-        "aiofiles==23.2.1",
-        "watchdog==3.0.0",
-        "httpx==0.25.1",
-        "pywebview==5.4",
-        "bcrypt==4.0.1"
-    ]
-    
-    for dep in dependencies:
-        print(f"  Installing {dep}...")
-        result = subprocess.run([str(python_venv), "-m", "pip", "install", dep], 
-                              capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"⚠️  Warning: Failed to install {dep}: {result.stderr}")
-    
-    # Create the optimized main executable
-    print("⚡ Creating optimized launcher...")
-    
-    main_executable = '''#!/usr/bin/env python3
+from build_utils import (
+    PIP_CACHE_DIR, apfs_clone, cached_venv, clone_venv, create_dmg, maybe_upgrade_pip,
+    precompile, remove_paths, write_bundle_files
+)
+
+# Pre-built venv that each build clones instead of reinstalling from scratch
+VENV_CACHE_DIR = Path.home() / ".cache" / "mcp_venv_build" / "final"
+
+# Pinned runtime dependencies
+DEPENDENCIES = [
+    "fastapi==0.104.1",
+    "orjson==3.9.10",
+    "uvicorn==0.24.0",
+    "uvloop==0.19.0",
+    "httptools==0.6.1",
+    "pydantic==2.4.2",
+    "pydantic-settings==2.1.0",
+    "python-dotenv==1.0.0",
+    "pyyaml==6.0.1",
+    "loguru==0.7.2",
+    "python-jose[cryptography]==3.3.0",
+    "passlib[bcrypt]==1.7.4",
+    "python-multipart==0.0.6",
+    "aiofiles==23.2.1",
+    "watchdog==3.0.0",
+    "httpx==0.25.1",
+    "pywebview==5.4",
+    "bcrypt==4.0.1"
+]
+
+# Launcher installed as Contents/MacOS/MCP
+MAIN_EXECUTABLE_SRC = '''#!/usr/bin/env python3
 """
 MCP Application - Final Working Version
 Uses pre-installed dependencies with proper path handling.
@@ -141,6 +51,8 @@ Uses pre-installed dependencies with proper path handling.
 
 import sys
 import os
+import shutil
+import socket
 import subprocess
 import time
 import signal
@@ -154,11 +66,11 @@ def setup_environment():
     # Clear logs on every launch
     log_dir = Path.home() / "Library" / "Logs" / "MCP"
     if log_dir.exists():
-        for log_file in log_dir.glob("*.log"):
-            try:
-                log_file.unlink()
-            except:
-                pass
+        try:
+            shutil.rmtree(log_dir)
+        except OSError:
+            pass
+    log_dir.mkdir(parents=True, exist_ok=True)
     
     # Set up virtual environment paths
     venv_path = app_dir / "venv"
@@ -189,13 +101,20 @@ def setup_environment():
 
 def kill_existing_processes():
     """Kill any existing MCP processes."""
+    # Nothing listening means nothing to kill, so skip forking lsof
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.settimeout(0.05)
+        if probe.connect_ex(("127.0.0.1", 8080)) != 0:
+            return
+    
     try:
-        result = subprocess.run(["lsof", "-ti:8080"], capture_output=True, text=True)
+        result = subprocess.run(["lsof", "-nP", "-iTCP:8080", "-sTCP:LISTEN", "-t"],
+                                capture_output=True, text=True)
         if result.stdout:
             pids = result.stdout.strip().split('\\n')
             for pid in pids:
                 if pid:
-                    subprocess.run(["kill", "-9", pid], capture_output=True)
+                    subprocess.run(["kill", "-9", pid], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
                     print(f"Killed existing process {pid} using port 8080")
     except:
         pass
@@ -238,27 +157,192 @@ def main():
 if __name__ == "__main__":
     sys.exit(main())
 '''
+
+def build_reference_venv(cache_root, python_cmd):
+    """Create the reference venv under cache_root, or reuse it if still current.
+    
+    The venv is keyed on the interpreter and the pinned dependencies, so it
+    is only rebuilt when one of them changes.
+    """
+    version = subprocess.run([python_cmd, "--version"], capture_output=True, text=True).stdout
+    return cached_venv(cache_root, python_cmd, [version.strip()] + DEPENDENCIES, install_dependencies)
+
+def install_dependencies(venv_path):
+    """Install the pinned dependencies into venv_path; return whether all succeeded."""
+    python_venv = venv_path / "bin" / "python"
+    pip_env = {**os.environ, "PIP_CACHE_DIR": str(PIP_CACHE_DIR)}
+    
+    maybe_upgrade_pip([python_venv, "-m", "pip"], pip_env)
+    
+    pip_flags = ["--no-input", "--disable-pip-version-check", "--no-color", "--prefer-binary"]
+    pip_install = [str(python_venv), "-m", "pip", "install"] + pip_flags
+    
+    # Download the pinned wheels concurrently; installing stays in a single
+    # pip process since parallel installs into one venv would race
+    print(f"  Downloading {len(DEPENDENCIES)} packages...")
+    wheelhouse = PIP_CACHE_DIR / "wheels"
+    pip_download = [str(python_venv), "-m", "pip", "download", "--no-deps",
+                    "-d", str(wheelhouse)] + pip_flags
+    with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, len(DEPENDENCIES))) as executor:
+        futures = {
+            executor.submit(subprocess.run, pip_download + [dep],
+                            capture_output=True, text=True, env=pip_env): dep
+            for dep in DEPENDENCIES
+        }
+        for future in as_completed(futures):
+            if future.result().returncode != 0:
+                print(f"⚠️  Warning: Failed to download {futures[future]}")
+    
+    # Resolve and install everything in a single pip run, reusing the cached wheels
+    print(f"  Installing {len(DEPENDENCIES)} packages...")
+    pip_install += ["--find-links", str(wheelhouse)]
+    result = subprocess.run(pip_install + DEPENDENCIES, capture_output=True, text=True, env=pip_env)
+    complete = result.returncode == 0
+
+    # Fall back to one package at a time so a single bad pin doesn't block the rest
+    if not complete:
+        print("⚠️  Batch install failed, retrying packages individually...")
+        complete = True
+        for dep in DEPENDENCIES:
+            print(f"  Installing {dep}...")
+            result = subprocess.run(pip_install + [dep], capture_output=True, text=True, env=pip_env)
+            if result.returncode != 0:
+                print(f"⚠️  Warning: Failed to install {dep}: {result.stderr}")
+                complete = False
+    
+    link_duplicate_stdlib(venv_path)
+    prune_venv(venv_path)
+    
+    print("⚙️  Pre-compiling installed packages...")
+    precompile(python_venv, venv_path / "lib")
+    
+    return complete
+
+def link_duplicate_stdlib(venv_path):
+    """Replace stdlib files duplicated into the venv with symlinks to the base install.
+    
+    Some framework and Homebrew builds copy parts of the standard library into
+    lib/pythonX.Y. Only files identical to the base interpreter's copy are
+    linked; site-packages is left untouched.
+    """
+    result = subprocess.run(
+        [str(venv_path / "bin" / "python"), "-c", "import sysconfig; print(sysconfig.get_path('stdlib'))"],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return
+    stdlib = Path(result.stdout.strip())
+    
+    for lib_dir in (venv_path / "lib").glob("python*"):
+        if not stdlib.is_dir() or lib_dir.resolve() == stdlib.resolve():
+            continue
+        for root, dirs, files in os.walk(lib_dir):
+            if Path(root) == lib_dir and "site-packages" in dirs:
+                dirs.remove("site-packages")
+            for name in files:
+                path = Path(root) / name
+                system_path = stdlib / path.relative_to(lib_dir)
+                if (not path.is_symlink() and system_path.is_file()
+                        and filecmp.cmp(path, system_path, shallow=False)):
+                    path.unlink()
+                    path.symlink_to(system_path)
+
+def prune_venv(venv_path):
+    """Strip bytecode caches and bundled test suites from the venv.
+    
+    None of it is needed at runtime, and every byte left in the venv has to
+    be copied and compressed into the DMG.
+    """
+    print("🧹 Pruning virtual environment...")
+    for pattern in ("__pycache__", "tests"):
+        for path in list((venv_path / "lib").rglob(pattern)):
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+
+def create_final_dmg():
+    """Create the final working DMG installer."""
     
-    # Write the main executable
-    main_exec_path = macos_path / "MCP"
-    with open(main_exec_path, 'w') as f:
-        f.write(main_executable)
-    os.chmod(main_exec_path, 0o755)
+    print("🚀 Creating MCP Final Professional Installer (Python 3.12)...")
     
-    # Copy application files
-    print("📄 Copying application files...")
-    for item in ["src", "config"]:
-        if os.path.exists(item):
-            if os.path.isdir(item):
-                shutil.copytree(item, macos_path / item)
+    # One directory read answers every "does this exist" check below
+    with os.scandir('.') as it:
+        entries = {entry.name: entry for entry in it}
+    
+    # Clean up any existing builds
+    build_items = ["MCP.app", "MCP_Professional_Installer.dmg", "MCP_Final_Installer.dmg", "dmg_temp", "dist"]
+    existing_items = [item for item in build_items if item in entries]
+    for item in existing_items:
+        print(f"🧹 Cleaning up {item}...")
+    remove_paths(existing_items)
+    
+    # Create distribution directory
+    dist_path = Path("dist")
+    dist_path.mkdir(exist_ok=True)
+    
+    print("📦 Building MCP Application Bundle (Python 3.12)...")
+    
+    # Create app bundle structure
+    app_path = dist_path / "MCP.app"
+    contents_path = app_path / "Contents"
+    macos_path = contents_path / "MacOS"
+    resources_path = contents_path / "Resources"
+    
+    # Create directories
+    macos_path.mkdir(parents=True, exist_ok=True)
+    resources_path.mkdir(parents=True, exist_ok=True)
     
-    # Copy launch.py
-    if os.path.exists("launch.py"):
-        shutil.copy2("launch.py", macos_path / "launch.py")
+    # Force Python 3.12 usage
+    print("🐍 Creating virtual environment with Python 3.12...")
+    python_executables = [
+        "/usr/bin/python3.12",
+        "/usr/local/bin/python3.12", 
+        "/opt/homebrew/bin/python3.12",
+        "/Library/Frameworks/Python.framework/Versions/3.12/bin/python3.12",
+        "python3.12",
+        "python3"
+    ]
     
-    # Copy requirements.txt for reference
-    if os.path.exists("requirements.txt"):
-        shutil.copy2("requirements.txt", macos_path / "requirements.txt")
+    # Only probe candidates that actually exist, and probe them concurrently
+    candidates = [cmd for cmd in python_executables if shutil.which(cmd)]
+    
+    def probe_python(cmd):
+        try:
+            result = subprocess.run([cmd, "--version"], capture_output=True, text=True, timeout=2)
+            return result.returncode == 0 and "3.12" in result.stdout
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+    
+    python_cmd = None
+    if candidates:
+        # Keep the preference order of the list above, whichever probe finishes first
+        with ThreadPoolExecutor(max_workers=len(candidates)) as executor:
+            for cmd, found in zip(candidates, executor.map(probe_python, candidates)):
+                if found:
+                    python_cmd = cmd
+                    print(f"✅ Found Python 3.12: {python_cmd}")
+                    break
+    
+    if not python_cmd:
+        print("❌ Python 3.12 not found! Please install Python 3.12")
+        return False
+    
+    # Create the optimized main executable
+    print("⚡ Creating optimized launcher...")
+    
+    # None of the bundle files depend on the venv, so write them while it builds
+    print("📄 Copying application files...")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        bundle_files = executor.submit(
+            write_bundle_files, entries, contents_path, macos_path, resources_path, MAIN_EXECUTABLE_SRC
+        )
+        
+        # Clone the cached reference venv instead of rebuilding it every time
+        print("📦 Installing dependencies with Python 3.12...")
+        reference_venv = build_reference_venv(VENV_CACHE_DIR, python_cmd)
+        clone_venv(reference_venv, macos_path / "venv")
+        
+        # Re-raise any failure from writing the bundle files
+        bundle_files.result()
     
     print("🎨 Creating final DMG installer...")
     
@@ -267,7 +351,7 @@ if __name__ == "__main__":
     dmg_temp.mkdir(exist_ok=True)
     
     # Copy app to DMG directory
-    shutil.copytree(app_path, dmg_temp / "MCP.app")
+    apfs_clone(app_path, dmg_temp / "MCP.app")
     
     # Create Applications symlink
     applications_link = dmg_temp / "Applications"
@@ -316,8 +400,7 @@ Enjoy your MCP Control Panel! 🎊
 Built with Python 3.12 for maximum compatibility.
 """
     
-    with open(dmg_temp / "📖 Installation Guide.txt", 'w') as f:
-        f.write(readme_content)
+    (dmg_temp / "📖 Installation Guide.txt").write_text(readme_content)
     
     # Create the final DMG
     dmg_name = "MCP_Final_Installer.dmg"
@@ -328,18 +411,7 @@ Built with Python 3.12 for maximum compatibility.
         os.remove(dmg_name)
     
     # Create DMG using hdiutil
-    create_dmg_cmd = [
-        "hdiutil", "create",
-        "-srcfolder", str(dmg_temp),
-        "-volname", "MCP Control Panel - Final",
-        "-fs", "HFS+",
-        "-fsargs", "-c c=64,a=16,e=16",
-        "-format", "UDBZ",
-        "-imagekey", "zlib-level=9",
-        dmg_name
-    ]
-    
-    result = subprocess.run(create_dmg_cmd, capture_output=True, text=True)
+    result = create_dmg(dmg_temp, "MCP Control Panel - Final", dmg_name)
     
     if result.returncode == 0:
         file_size = os.path.getsize(dmg_name) / (1024*1024)
@@ -1,5 +1,6 @@
 from PIL import Image, ImageDraw, ImageFont
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 def create_icon():
     # Create a 1024x1024 image with a dark background
@@ -25,11 +26,14 @@ def create_icon():
     if not os.path.exists(iconset_dir):
         os.makedirs(iconset_dir)
     
-    # Generate different sizes
-    for s in sizes:
+    # Generate different sizes in parallel (PIL releases the GIL while resizing and encoding)
+    def save_size(s):
         resized = image.resize((s, s), Image.Resampling.LANCZOS)
         resized.save(f"{iconset_dir}/icon_{s}x{s}.png")
     
+    with ThreadPoolExecutor(max_workers=min(len(sizes), os.cpu_count() or 1)) as executor:
+        list(executor.map(save_size, sizes))
+    
     print("Icon files created successfully!")
     print("To create .icns file, run the following command in terminal:")
     print("iconutil -c icns MCP.iconset")
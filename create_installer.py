@@ -4,19 +4,50 @@ MCP Application Installer
 Creates a properly configured application bundle with pre-installed dependencies.
 """
 
+import base64
 import os
 import shutil
 import subprocess
 import sys
 from pathlib import Path
 
+from build_utils import PIP_CACHE_DIR, fast_copy, fast_copytree, maybe_upgrade_pip, precompile
+
+# Info.plist for the MCP.app bundle, embedded as a pre-serialized binary plist:
+#   CFBundleName: 'MCP'
+#   CFBundleDisplayName: 'MCP Control Panel'
+#   CFBundleIdentifier: 'com.mcp.controlpanel'
+#   CFBundleVersion: '1.0.0'
+#   CFBundleShortVersionString: '1.0.0'
+#   CFBundleExecutable: 'launcher'
+#   CFBundleIconFile: 'MCP.icns'
+#   LSApplicationCategoryType: 'public.app-category.developer-tools'
+#   NSHighResolutionCapable: True
+#   LSMinimumSystemVersion: '10.14'
+# Regenerate with base64.b64encode(plistlib.dumps(info, fmt=plistlib.FMT_BINARY))
+INFO_PLIST_BIN = base64.b64decode(
+    "YnBsaXN0MDDaAQIDBAUGBwgJCgsMDQ4PEBAREhNfEBNDRkJ1bmRsZURpc3BsYXlOYW1lXxAS"
+    "Q0ZCdW5kbGVFeGVjdXRhYmxlXxAQQ0ZCdW5kbGVJY29uRmlsZV8QEkNGQnVuZGxlSWRlbnRp"
+    "ZmllclxDRkJ1bmRsZU5hbWVfEBpDRkJ1bmRsZVNob3J0VmVyc2lvblN0cmluZ18QD0NGQnVu"
+    "ZGxlVmVyc2lvbl8QGUxTQXBwbGljYXRpb25DYXRlZ29yeVR5cGVfEBZMU01pbmltdW1TeXN0"
+    "ZW1WZXJzaW9uXxAXTlNIaWdoUmVzb2x1dGlvbkNhcGFibGVfEBFNQ1AgQ29udHJvbCBQYW5l"
+    "bFhsYXVuY2hlclhNQ1AuaWNuc18QFGNvbS5tY3AuY29udHJvbHBhbmVsU01DUFUxLjAuMF8Q"
+    "I3B1YmxpYy5hcHAtY2F0ZWdvcnkuZGV2ZWxvcGVyLXRvb2xzVTEwLjE0CQAIAB0AMwBIAFsA"
+    "cAB9AJoArADIAOEA+wEPARgBIQE4ATwBQgFoAW4AAAAAAAACAQAAAAAAAAAUAAAAAAAAAAAA"
+    "AAAAAAABbw=="
+)
+
 def create_installer():
     """Create the MCP application with all dependencies pre-installed."""
     
     print("🚀 Creating MCP Application Installer...")
     
+    # One directory read answers every "does this exist" check below
+    with os.scandir('.') as it:
+        entries = {entry.name: entry for entry in it}
+    
     # Remove existing app if it exists
-    if os.path.exists("MCP.app"):
+    if "MCP.app" in entries:
         print("📁 Removing existing MCP.app...")
         shutil.rmtree("MCP.app")
     
@@ -31,27 +62,12 @@ def create_installer():
     resources_path.mkdir(parents=True, exist_ok=True)
     
     # Create Info.plist
-    info_plist = {
-        'CFBundleName': 'MCP',
-        'CFBundleDisplayName': 'MCP Control Panel',
-        'CFBundleIdentifier': 'com.mcp.controlpanel',
-        'CFBundleVersion': '1.0.0',
-        'CFBundleShortVersionString': '1.0.0',
-        'CFBundleExecutable': 'launcher',
-        'CFBundleIconFile': 'MCP.icns',
-        'LSApplicationCategoryType': 'public.app-category.developer-tools',
-        'NSHighResolutionCapable': True,
-        'LSMinimumSystemVersion': '10.14'
-    }
-    
-    import plistlib
-    with open(contents_path / "Info.plist", 'wb') as f:
-        plistlib.dump(info_plist, f)
+    (contents_path / "Info.plist").write_bytes(INFO_PLIST_BIN)
     
     # Copy icon if it exists
-    if os.path.exists("MCP.icns"):
+    if "MCP.icns" in entries:
         print("🎨 Copying application icon...")
-        shutil.copy2("MCP.icns", resources_path / "MCP.icns")
+        fast_copy("MCP.icns", resources_path / "MCP.icns")
     
     # Create virtual environment
     print("🐍 Creating virtual environment...")
@@ -61,21 +77,25 @@ def create_installer():
     # Install dependencies
     print("📦 Installing dependencies (this may take a moment)...")
     pip_path = venv_path / "bin" / "pip"
-    subprocess.run([str(pip_path), "install", "--upgrade", "pip"], check=True)
-    subprocess.run([str(pip_path), "install", "-r", "requirements.txt"], check=True)
+    pip_env = {**os.environ, "PIP_CACHE_DIR": str(PIP_CACHE_DIR)}
+    maybe_upgrade_pip([pip_path], pip_env)
+    subprocess.run([str(pip_path), "install", "--prefer-binary", "-r", "requirements.txt"],
+                   check=True, env=pip_env)
+    
+    precompile(venv_path / "bin" / "python", venv_path / "lib")
     
     # Copy application files
     print("📄 Copying application files...")
     for item in ["src", "config", "launch.py"]:
-        if os.path.exists(item):
-            if os.path.isdir(item):
-                shutil.copytree(item, macos_path / item)
+        if item in entries:
+            if entries[item].is_dir():
+                fast_copytree(item, macos_path / item)
             else:
-                shutil.copy2(item, macos_path / item)
+                fast_copy(item, macos_path / item)
     
     # Copy requirements.txt
-    if os.path.exists("requirements.txt"):
-        shutil.copy2("requirements.txt", macos_path / "requirements.txt")
+    if "requirements.txt" in entries:
+        fast_copy("requirements.txt", macos_path / "requirements.txt")
     
     # Create optimized launcher script
     launcher_script = f'''#!/bin/bash
@@ -100,8 +120,7 @@ exec python launch.py
 '''
     
     launcher_path = macos_path / "launcher"
-    with open(launcher_path, 'w') as f:
-        f.write(launcher_script)
+    launcher_path.write_text(launcher_script)
     
     # Make launcher executable
     os.chmod(launcher_path, 0o755)
@@ -9,133 +9,19 @@ import shutil
 import subprocess
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def create_background_image():
-    """Create a modern background image for the DMG using Python."""
-    try:
-        from PIL import Image, ImageDraw, ImageFont
-        
-        # Create a modern gradient background
-        width, height = 600, 400
-        img = Image.new('RGB', (width, height), '#f0f0f0')
-        draw = ImageDraw.Draw(img)
-        
-        # Create gradient effect
-        for y in range(height):
-            color_value = int(240 - (y / height) * 20)
-            color = (color_value, color_value, color_value + 10)
-            draw.line([(0, y), (width, y)], fill=color)
-        
-        # Add MCP branding
-        try:
-            # Try to use a nice font, fallback to default
-            font_large = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 48)
-            font_medium = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 24)
-            font_small = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 16)
-        except:
-            font_large = ImageFont.load_default()
-            font_medium = ImageFont.load_default()
-            font_small = ImageFont.load_default()
-        
-        # Draw title
-        draw.text((50, 50), "MCP Control Panel", fill='#333333', font=font_large)
-        draw.text((50, 110), "Master Control Program for macOS", fill='#666666', font=font_medium)
-        
-        # Draw installation instructions
-        draw.text((50, 180), "Installation Instructions:", fill='#333333', font=font_medium)
-        draw.text((50, 220), "1. Drag MCP.app to the Applications folder", fill='#555555', font=font_small)
-        draw.text((50, 245), "2. Launch MCP from your Applications", fill='#555555', font=font_small)
-        draw.text((50, 270), "3. Grant permissions when prompted", fill='#555555', font=font_small)
-        
-        # Draw arrow pointing to Applications
-        arrow_points = [(450, 200), (500, 180), (500, 190), (580, 190), (580, 210), (500, 210), (500, 220)]
-        draw.polygon(arrow_points, fill='#007AFF')
-        
-        # Save background
-        img.save('dmg_background.png')
-        return True
-        
-    except ImportError:
-        print("PIL not available, creating simple background...")
-        # Create a simple text file instead
-        with open('dmg_background.txt', 'w') as f:
-            f.write("Drag MCP.app to Applications folder to install")
-        return False
+from build_utils import (
+    PIP_CACHE_DIR, apfs_clone, cached_venv, clone_venv, create_dmg, maybe_upgrade_pip,
+    remove_paths, write_bundle_files
+)
 
-def create_professional_dmg():
-    """Create a professional DMG installer with pre-installed dependencies."""
-    
-    print("🚀 Creating MCP Professional Installer with Pre-installed Dependencies...")
-    
-    # Clean up any existing builds
-    build_items = ["MCP.app", "MCP_Installer.dmg", "dmg_temp", "dist", "dmg_background.png"]
-    for item in build_items:
-        if os.path.exists(item):
-            print(f"🧹 Cleaning up {item}...")
-            if os.path.isdir(item):
-                shutil.rmtree(item)
-            else:
-                os.remove(item)
-    
-    # Create distribution directory
-    dist_path = Path("dist")
-    dist_path.mkdir(exist_ok=True)
-    
-    print("📦 Building MCP Application Bundle with Pre-installed Dependencies...")
-    
-    # Create app bundle structure
-    app_path = dist_path / "MCP.app"
-    contents_path = app_path / "Contents"
-    macos_path = contents_path / "MacOS"
-    resources_path = contents_path / "Resources"
-    
-    # Create directories
-    macos_path.mkdir(parents=True, exist_ok=True)
-    resources_path.mkdir(parents=True, exist_ok=True)
-    
-    # Create Info.plist
-    info_plist = {
-        'CFBundleName': 'MCP',
-        'CFBundleDisplayName': 'MCP Control Panel',
-        'CFBundleIdentifier': 'com.mcp.controlpanel',
-        'CFBundleVersion': '1.0.0',
-        'CFBundleShortVersionString': '1.0.0',
-        'CFBundleExecutable': 'MCP',
-        'CFBundleIconFile': 'MCP.icns',
-        'LSApplicationCategoryType': 'public.app-category.developer-tools',
-        'NSHighResolutionCapable': True,
-        'LSMinimumSystemVersion': '10.14',
-        'NSRequiresAquaSystemAppearance': False,
-        'LSUIElement': False
-    }
-    
-    import plistlib
-    with open(contents_path / "Info.plist", 'wb') as f:
-        plistlib.dump(info_plist, f)
-    
-    # Copy icon
-    if os.path.exists("MCP.icns"):
-        print("🎨 Adding application icon...")
-        shutil.copy2("MCP.icns", resources_path / "MCP.icns")
-    
-    # Create virtual environment with pre-installed dependencies
-    print("🐍 Creating virtual environment with pre-installed dependencies...")
-    venv_path = macos_path / "venv"
-    subprocess.run([sys.executable, "-m", "venv", str(venv_path)], check=True)
-    
-    # Install dependencies into the virtual environment
-    print("📦 Pre-installing all dependencies...")
-    pip_path = venv_path / "bin" / "pip"
-    subprocess.run([str(pip_path), "install", "--upgrade", "pip"], check=True)
-    
-    if os.path.exists("requirements.txt"):
-        subprocess.run([str(pip_path), "install", "-r", "requirements.txt"], check=True)
-    
-    # Create the optimized main executable
-    print("⚡ Creating optimized launcher...")
-    
-    main_executable = '''#!/usr/bin/env python3
+# Pre-built venv that each build clones instead of reinstalling from scratch
+VENV_CACHE_DIR = Path.home() / ".cache" / "mcp_venv_build" / "professional"
+
+# Launcher installed as Contents/MacOS/MCP
+MAIN_EXECUTABLE_SRC = '''#!/usr/bin/env python3
 """
 MCP Application Main Executable
 Optimized launcher with pre-installed dependencies.
@@ -143,6 +29,8 @@ Optimized launcher with pre-installed dependencies.
 
 import sys
 import os
+import shutil
+import socket
 import subprocess
 import time
 import signal
@@ -156,11 +44,11 @@ def setup_environment():
     # Clear logs on every launch
     log_dir = Path.home() / "Library" / "Logs" / "MCP"
     if log_dir.exists():
-        for log_file in log_dir.glob("*.log"):
-            try:
-                log_file.unlink()
-            except:
-                pass
+        try:
+            shutil.rmtree(log_dir)
+        except OSError:
+            pass
+    log_dir.mkdir(parents=True, exist_ok=True)
     
     # Activate virtual environment
     venv_path = app_dir / "venv"
@@ -184,13 +72,20 @@ def setup_environment():
 
 def kill_existing_processes():
     """Kill any existing MCP processes."""
+    # Nothing listening means nothing to kill, so skip forking lsof
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.settimeout(0.05)
+        if probe.connect_ex(("127.0.0.1", 8080)) != 0:
+            return
+    
     try:
-        result = subprocess.run(["lsof", "-ti:8080"], capture_output=True, text=True)
+        result = subprocess.run(["lsof", "-nP", "-iTCP:8080", "-sTCP:LISTEN", "-t"],
+                                capture_output=True, text=True)
         if result.stdout:
             pids = result.stdout.strip().split('\\n')
             for pid in pids:
                 if pid:
-                    subprocess.run(["kill", "-9", pid], capture_output=True)
+                    subprocess.run(["kill", "-9", pid], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
                     print(f"Killed existing process {pid} using port 8080")
     except:
         pass
@@ -231,27 +126,148 @@ def main():
 if __name__ == "__main__":
     sys.exit(main())
 '''
+
+def build_reference_venv(cache_root):
+    """Create the reference venv under cache_root, or reuse it if still current.
+    
+    The venv is keyed on the interpreter and requirements.txt, so it is only
+    rebuilt when one of them changes.
+    """
+    requirements = Path("requirements.txt")
+    key_parts = [sys.version]
+    if requirements.exists():
+        key_parts.append(requirements.read_text())
+    return cached_venv(cache_root, sys.executable, key_parts, install_requirements)
+
+def install_requirements(venv_path):
+    """Install requirements.txt into venv_path."""
+    requirements = Path("requirements.txt")
     
-    # Write the main executable
-    main_exec_path = macos_path / "MCP"
-    with open(main_exec_path, 'w') as f:
-        f.write(main_executable)
-    os.chmod(main_exec_path, 0o755)
+    # Install dependencies into the virtual environment
+    print("📦 Pre-installing all dependencies...")
+    pip_path = venv_path / "bin" / "pip"
+    pip_env = {**os.environ, "PIP_CACHE_DIR": str(PIP_CACHE_DIR)}
     
-    # Copy application files
-    print("📄 Copying application files...")
-    for item in ["src", "config"]:
-        if os.path.exists(item):
-            if os.path.isdir(item):
-                shutil.copytree(item, macos_path / item)
+    maybe_upgrade_pip([pip_path], pip_env)
     
-    # Copy launch.py
-    if os.path.exists("launch.py"):
-        shutil.copy2("launch.py", macos_path / "launch.py")
+    if requirements.exists():
+        subprocess.run([str(pip_path), "install", "--prefer-binary", "-r", str(requirements)],
+                       check=True, env=pip_env)
+    return True
+
+def create_background_image():
+    """Create a modern background image for the DMG using Python."""
+    try:
+        from PIL import Image, ImageDraw, ImageFont
+        
+        # Create a modern gradient background
+        width, height = 600, 400
+        try:
+            import numpy as np
+            
+            # Build the whole gradient as one array instead of drawing line by line
+            shade = (240 - np.arange(height) / height * 20).astype(np.uint8)
+            pixels = np.empty((height, width, 3), dtype=np.uint8)
+            pixels[..., 0] = shade[:, None]
+            pixels[..., 1] = shade[:, None]
+            pixels[..., 2] = (shade + 10)[:, None]
+            img = Image.fromarray(pixels, 'RGB')
+            draw = ImageDraw.Draw(img)
+        except ImportError:
+            img = Image.new('RGB', (width, height), '#f0f0f0')
+            draw = ImageDraw.Draw(img)
+            
+            # Create gradient effect
+            for y in range(height):
+                color_value = int(240 - (y / height) * 20)
+                color = (color_value, color_value, color_value + 10)
+                draw.line([(0, y), (width, y)], fill=color)
+        
+        # Add MCP branding
+        try:
+            # Try to use a nice font, fallback to default
+            font_large = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 48)
+            font_medium = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 24)
+            font_small = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 16)
+        except:
+            font_large = ImageFont.load_default()
+            font_medium = ImageFont.load_default()
+            font_small = ImageFont.load_default()
+        
+        # Draw title
+        draw.text((50, 50), "MCP Control Panel", fill='#333333', font=font_large)
+        draw.text((50, 110), "Master Control Program for macOS", fill='#666666', font=font_medium)
+        
+        # Draw installation instructions
+        draw.text((50, 180), "Installation Instructions:", fill='#333333', font=font_medium)
+        draw.text((50, 220), "1. Drag MCP.app to the Applications folder", fill='#555555', font=font_small)
+        draw.text((50, 245), "2. Launch MCP from your Applications", fill='#555555', font=font_small)
+        draw.text((50, 270), "3. Grant permissions when prompted", fill='#555555', font=font_small)
+        
+        # Draw arrow pointing to Applications
+        arrow_points = [(450, 200), (500, 180), (500, 190), (580, 190), (580, 210), (500, 210), (500, 220)]
+        draw.polygon(arrow_points, fill='#007AFF')
+        
+        # Save background
+        img.save('dmg_background.png')
+        return True
+        
+    except ImportError:
+        print("PIL not available, creating simple background...")
+        # Create a simple text file instead
+        with open('dmg_background.txt', 'w') as f:
+            f.write("Drag MCP.app to Applications folder to install")
+        return False
+
+def create_professional_dmg():
+    """Create a professional DMG installer with pre-installed dependencies."""
+    
+    print("🚀 Creating MCP Professional Installer with Pre-installed Dependencies...")
+    
+    # One directory read answers every "does this exist" check below
+    with os.scandir('.') as it:
+        entries = {entry.name: entry for entry in it}
     
-    # Copy requirements.txt for reference
-    if os.path.exists("requirements.txt"):
-        shutil.copy2("requirements.txt", macos_path / "requirements.txt")
+    # Clean up any existing builds
+    build_items = ["MCP.app", "MCP_Installer.dmg", "dmg_temp", "dist", "dmg_background.png"]
+    existing_items = [item for item in build_items if item in entries]
+    for item in existing_items:
+        print(f"🧹 Cleaning up {item}...")
+    remove_paths(existing_items)
+    
+    # Create distribution directory
+    dist_path = Path("dist")
+    dist_path.mkdir(exist_ok=True)
+    
+    print("📦 Building MCP Application Bundle with Pre-installed Dependencies...")
+    
+    # Create app bundle structure
+    app_path = dist_path / "MCP.app"
+    contents_path = app_path / "Contents"
+    macos_path = contents_path / "MacOS"
+    resources_path = contents_path / "Resources"
+    
+    # Create directories
+    macos_path.mkdir(parents=True, exist_ok=True)
+    resources_path.mkdir(parents=True, exist_ok=True)
+    
+    # Create the optimized main executable
+    print("⚡ Creating optimized launcher...")
+    
+    # None of the bundle files depend on the venv, so write them while it builds
+    print("📄 Copying application files...")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        bundle_files = executor.submit(
+            write_bundle_files, entries, contents_path, macos_path, resources_path, MAIN_EXECUTABLE_SRC
+        )
+        
+        # Clone the cached reference venv instead of rebuilding it every time
+        print("🐍 Creating virtual environment with pre-installed dependencies...")
+        reference_venv = build_reference_venv(VENV_CACHE_DIR)
+        clone_venv(reference_venv, macos_path / "venv")
+        
+        # Re-raise any failure from writing the bundle files
+        bundle_files.result()
     
     print("🎨 Creating modern DMG installer...")
     
@@ -263,7 +279,7 @@ if __name__ == "__main__":
     dmg_temp.mkdir(exist_ok=True)
     
     # Copy app to DMG directory
-    shutil.copytree(app_path, dmg_temp / "MCP.app")
+    apfs_clone(app_path, dmg_temp / "MCP.app")
     
     # Create Applications symlink
     applications_link = dmg_temp / "Applications"
@@ -308,8 +324,7 @@ if __name__ == "__main__":
 Enjoy your MCP Control Panel! 🎊
 """
     
-    with open(dmg_temp / "📖 Read Me.txt", 'w') as f:
-        f.write(readme_content)
+    (dmg_temp / "📖 Read Me.txt").write_text(readme_content)
     
     # Create the DMG
     dmg_name = "MCP_Professional_Installer.dmg"
@@ -320,18 +335,7 @@ Enjoy your MCP Control Panel! 🎊
         os.remove(dmg_name)
     
     # Create DMG using hdiutil with modern styling
-    create_dmg_cmd = [
-        "hdiutil", "create",
-        "-srcfolder", str(dmg_temp),
-        "-volname", "MCP Control Panel",
-        "-fs", "HFS+",
-        "-fsargs", "-c c=64,a=16,e=16",
-        "-format", "UDBZ",
-        "-imagekey", "zlib-level=9",
-        dmg_name
-    ]
-    
-    result = subprocess.run(create_dmg_cmd, capture_output=True, text=True)
+    result = create_dmg(dmg_temp, "MCP Control Panel", dmg_name)
     
     if result.returncode == 0:
         file_size = os.path.getsize(dmg_name) / (1024*1024)
@@ -1,10 +1,7 @@
-import webview
-import subprocess
+import threading
 import time
 import sys
 import os
-import signal
-import traceback
 from pathlib import Path
 
 # Add src to Python path
@@ -13,10 +10,10 @@ sys.path.append(src_path)
 
 from utils.logger import logger
 
-def is_port_in_use(port):
+def is_port_in_use(host, port):
     import socket
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        return s.connect_ex(('localhost', port)) == 0
+        return s.connect_ex((host, port)) == 0
 
 def start_fastapi_server():
     try:
@@ -30,53 +27,67 @@ def start_fastapi_server():
             logger.error(f"FastAPI script not found at {fastapi_script}")
             return None
         
+        from core.config import get_server_options
+        options = get_server_options()
+        
         # Check if port is already in use
-        if is_port_in_use(8080):
-            logger.warning("Port 8080 is already in use. The server might already be running.")
+        if is_port_in_use(options["host"], options["port"]):
+            logger.warning(f"Port {options['port']} is already in use. The server might already be running.")
             return None
         
-        # Start FastAPI server as a subprocess
+        # Run uvicorn in-process on a background thread
         logger.info("Starting FastAPI server...")
-        fastapi_proc = subprocess.Popen(
-            [sys.executable, fastapi_script],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
+        import uvicorn
+        # log_config=None keeps uvicorn's loggers routed to loguru by utils.logger
+        config = uvicorn.Config("main:app", log_config=None, timeout_graceful_shutdown=3, **options)
+        server = uvicorn.Server(config)
+        server_thread = threading.Thread(target=server.run, daemon=True)
+        server_thread.start()
         
-        # Simple wait for the server to start
+        # uvicorn sets server.started once it is accepting connections
         logger.info('Waiting for FastAPI server to start...')
-        time.sleep(3)  # Give the server time to start
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and server_thread.is_alive() and not server.started:
+            time.sleep(0.02)
         
-        # Check if process is still running
-        if fastapi_proc.poll() is not None:
-            stdout, stderr = fastapi_proc.communicate()
-            logger.error(f"FastAPI server failed to start. Error: {stderr}")
+        if not server.started:
+            logger.error("FastAPI server failed to start")
+            server.should_exit = True
             return None
         
         logger.info("FastAPI server started successfully")
-        return fastapi_proc
+        return server, server_thread
     except Exception as e:
-        logger.error(f"Error starting FastAPI server: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error starting FastAPI server: {str(e)}")
         return None
 
+def stop_fastapi_server(server, server_thread):
+    logger.info("Shutting down FastAPI server...")
+    server.should_exit = True
+    # The thread is a daemon, so a server stuck on a request can be abandoned
+    server_thread.join(timeout=5)
+    if server_thread.is_alive():
+        logger.warning("FastAPI server did not stop in time, exiting anyway")
+
 def main():
     try:
         logger.info("Starting MCP application...")
         
         # Start the FastAPI server
-        fastapi_proc = start_fastapi_server()
-        if not fastapi_proc:
+        fastapi_server = start_fastapi_server()
+        if not fastapi_server:
             logger.error("Failed to start FastAPI server")
             return
         
         # Create and start the webview window
         try:
             logger.info("Creating webview window...")
+            import webview
+            from core.config import get_settings
+            settings = get_settings()
             window = webview.create_window(
                 'MCP Control Panel',
-                'http://localhost:8080/docs',
+                f'http://{settings.host}:{settings.port}/docs',
                 width=1200,
                 height=800,
                 resizable=True,
@@ -85,21 +96,16 @@ def main():
             logger.info("Starting webview...")
             webview.start(debug=True)
         except Exception as e:
-            logger.error(f"Error creating webview window: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error creating webview window: {str(e)}")
         finally:
             # Cleanup when the window is closed
-            if fastapi_proc:
-                logger.info("Shutting down FastAPI server...")
-                fastapi_proc.terminate()
-                fastapi_proc.wait()
+            stop_fastapi_server(*fastapi_server)
+            fastapi_server = None
     
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
-        logger.error(traceback.format_exc())
-        if 'fastapi_proc' in locals() and fastapi_proc:
-            fastapi_proc.terminate()
-            fastapi_proc.wait()
+        logger.exception(f"Unexpected error: {str(e)}")
+        if 'fastapi_server' in locals() and fastapi_server:
+            stop_fastapi_server(*fastapi_server)
     
     logger.info("MCP application shutdown complete")
 
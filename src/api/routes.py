@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from typing import Dict, List
 from loguru import logger
 
@@ -7,21 +7,25 @@ from core.plugin import PluginCommand, PluginResponse
 
 router = APIRouter()
 
-# Dependency to get plugin manager
-def get_plugin_manager() -> PluginManager:
-    from main import plugin_manager
-    return plugin_manager
+# Dependency to get plugin manager from the app state
+def get_plugin_manager(request: Request) -> PluginManager:
+    return request.app.state.plugin_manager
 
-@router.get("/plugins")
+@router.get(
+    "/plugins",
+    responses={200: {
+        "description": "Info of each loaded plugin, keyed by plugin name",
+        "content": {"application/json": {"schema": {"type": "object", "additionalProperties": {"type": "object"}}}}
+    }}
+)
 async def list_plugins(
     plugin_manager: PluginManager = Depends(get_plugin_manager)
-) -> Dict[str, Dict]:
+) -> Response:
     """List all loaded plugins and their status."""
-    plugins = plugin_manager.list_plugins()
-    return {
-        name: plugin.get_info()
-        for name, plugin in plugins.items()
-    }
+    return Response(
+        content=plugin_manager.plugin_info_json(),
+        media_type="application/json"
+    )
 
 @router.get("/plugins/{plugin_name}")
 async def get_plugin_info(
@@ -30,8 +34,7 @@ async def get_plugin_info(
 ) -> Dict:
     """Get information about a specific plugin."""
     try:
-        plugin = plugin_manager.get_plugin(plugin_name)
-        return plugin.get_info()
+        return plugin_manager.get_plugin_info(plugin_name)
     except KeyError:
         raise HTTPException(
             status_code=404,
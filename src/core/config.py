@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
-from typing import List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 import os
 from pathlib import Path
 
@@ -37,4 +38,25 @@ class Settings(BaseSettings):
         
         # Set up logging
         if self.log_file:
-            self.log_file.parent.mkdir(parents=True, exist_ok=True) 
\ No newline at end of file
+            self.log_file.parent.mkdir(parents=True, exist_ok=True) 
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the shared application settings.
+    
+    Settings are parsed from the environment and .env file once and reused,
+    rather than re-read by every caller.
+    """
+    return Settings()
+
+def get_server_options() -> Dict[str, Any]:
+    """Get the uvicorn options shared by every way of starting the server."""
+    settings = get_settings()
+    return {
+        "host": settings.host,
+        "port": settings.port,
+        "log_level": settings.log_level.lower(),
+        "access_log": False,
+        "loop": "auto",  # Picks uvloop/httptools when installed
+        "http": "auto"
+    }
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 from pydantic import BaseModel
 
 class PluginCommand(BaseModel):
@@ -13,12 +13,45 @@ class PluginResponse(BaseModel):
     data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
+CommandHandler = Callable[[], Awaitable[PluginResponse]]
+
 class Plugin(ABC):
     """Base class for all MCP plugins."""
     
     def __init__(self, name: str):
         self.name = name
         self._initialized = False
+        self._handlers: Dict[str, CommandHandler] = {}
+    
+    def register_command(self, name: str, handler: CommandHandler) -> None:
+        """Register a handler for a command.
+        
+        Registered handlers are looked up by dispatch_command.
+        
+        Args:
+            name: The command name to handle
+            handler: Coroutine function returning the command's PluginResponse
+        """
+        self._handlers[name] = handler
+    
+    async def dispatch_command(self, command: PluginCommand) -> PluginResponse:
+        """Run the handler registered for a command.
+        
+        Plugins can call this from handle_command instead of an if/elif chain.
+        
+        Args:
+            command: The command to handle
+            
+        Returns:
+            The handler's PluginResponse, or an error response for unknown commands
+        """
+        handler = self._handlers.get(command.command)
+        if handler is None:
+            return PluginResponse(
+                success=False,
+                error=f"Unknown command: {command.command}"
+            )
+        return await handler()
     
     @abstractmethod
     async def initialize(self) -> None:
@@ -57,6 +90,9 @@ class Plugin(ABC):
     def get_info(self) -> Dict[str, Any]:
         """Get information about the plugin.
         
+        The API serves the info captured when the plugin was loaded, so it
+        should describe the plugin rather than change between requests.
+        
         Returns:
             A dictionary containing plugin information
         """
@@ -1,70 +1,150 @@
+import asyncio
 import importlib
 import inspect
+import os
+from importlib.metadata import entry_points
 from pathlib import Path
-from typing import Dict, Type
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Type
+
+import orjson
+from fastapi.encoders import jsonable_encoder
 from loguru import logger
 
 from core.plugin import Plugin
-from core.config import Settings
+from core.config import get_settings
+
+PLUGIN_ENTRY_POINT_GROUP = "mcp.plugins"
+
+def _plugin_entry_points():
+    """Get the entry points registered under the plugin group."""
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        return eps.select(group=PLUGIN_ENTRY_POINT_GROUP)
+    # Python 3.9 returns a plain dict of groups
+    return eps.get(PLUGIN_ENTRY_POINT_GROUP, [])
 
 class PluginManager:
     """Manages the loading and lifecycle of plugins."""
     
     def __init__(self):
         self.plugins: Dict[str, Plugin] = {}
-        self.settings = Settings()
+        self.settings = get_settings()
+        
+        # Plugin info only changes on load/shutdown, so build it once per plugin
+        self._plugin_info: Dict[str, Dict[str, Any]] = {}
+        
+        # Read-only live view handed out to callers instead of a copy
+        self._plugins_view = MappingProxyType(self.plugins)
+        
+        # Serialized plugin info for /plugins, rebuilt lazily after changes
+        self._info_cache: Optional[bytes] = None
     
-    async def initialize_plugins(self):
-        """Initialize all enabled plugins."""
+    def _discover_plugin_classes(self) -> List[Type[Plugin]]:
+        """Collect plugin classes from the plugins directory and entry points.
+        
+        Plugin modules expose their class as ``PLUGIN_CLASS``; installed
+        packages register theirs under the ``mcp.plugins`` entry point group.
+        """
+        plugin_classes: List[Type[Plugin]] = []
         plugins_dir = self.settings.plugins_dir
         
         if not plugins_dir.exists():
             logger.warning(f"Plugins directory {plugins_dir} does not exist")
-            return
+        else:
+            # Load all Python files in the plugins directory; DirEntry answers
+            # is_file() from the cached file type and only stats symlinks
+            with os.scandir(plugins_dir) as it:
+                for entry in it:
+                    if not entry.is_file():
+                        continue
+                    name = entry.name
+                    if not name.endswith(".py") or name.startswith("__"):
+                        continue
+                    stem = name[:-3]
+                    
+                    try:
+                        module = importlib.import_module(f"plugins.{stem}")
+                    except Exception as e:
+                        logger.error(f"Failed to load plugin {name}: {str(e)}")
+                        continue
+                    
+                    plugin_class = getattr(module, "PLUGIN_CLASS", None)
+                    if plugin_class is None:
+                        logger.warning(f"Plugin module {name} does not define PLUGIN_CLASS, skipping")
+                        continue
+                    plugin_classes.append(plugin_class)
+        
+        # Load plugins registered by installed packages
+        for entry_point in _plugin_entry_points():
+            try:
+                plugin_classes.append(entry_point.load())
+            except Exception as e:
+                logger.error(f"Failed to load plugin entry point {entry_point.name}: {str(e)}")
         
-        # Load all Python files in the plugins directory
-        for plugin_file in plugins_dir.glob("*.py"):
-            if plugin_file.name.startswith("__"):
+        return plugin_classes
+    
+    async def initialize_plugins(self):
+        """Initialize all enabled plugins concurrently."""
+        pending: List[Tuple[str, Plugin]] = []
+        pending_names = set()
+        
+        for plugin_class in self._discover_plugin_classes():
+            if (not inspect.isclass(plugin_class) or
+                not issubclass(plugin_class, Plugin) or
+                plugin_class is Plugin):
+                logger.warning(f"{plugin_class!r} is not a Plugin subclass, skipping")
                 continue
-                
+            
             try:
-                # Import the plugin module
-                module_name = f"plugins.{plugin_file.stem}"
-                module = importlib.import_module(module_name)
-                
-                # Find all Plugin subclasses in the module
-                for name, obj in inspect.getmembers(module):
-                    if (inspect.isclass(obj) and 
-                        issubclass(obj, Plugin) and 
-                        obj != Plugin):
-                        
-                        # Initialize the plugin
-                        plugin = obj()
-                        plugin_name = plugin.name
-                        
-                        if plugin_name in self.plugins:
-                            logger.warning(f"Plugin {plugin_name} already loaded, skipping")
-                            continue
-                            
-                        if (not self.settings.enabled_plugins or 
-                            plugin_name in self.settings.enabled_plugins):
-                            await plugin.initialize()
-                            self.plugins[plugin_name] = plugin
-                            logger.info(f"Loaded plugin: {plugin_name}")
-                
+                plugin = plugin_class()
             except Exception as e:
-                logger.error(f"Failed to load plugin {plugin_file.name}: {str(e)}")
+                logger.error(f"Failed to load plugin {plugin_class.__name__}: {str(e)}")
+                continue
+            
+            plugin_name = plugin.name
+            if plugin_name in self.plugins or plugin_name in pending_names:
+                logger.warning(f"Plugin {plugin_name} already loaded, skipping")
+                continue
+            
+            if (not self.settings.enabled_plugins or
+                plugin_name in self.settings.enabled_plugins):
+                pending.append((plugin_name, plugin))
+                pending_names.add(plugin_name)
+        
+        # Run plugin setups concurrently so their I/O waits overlap
+        results = await asyncio.gather(
+            *(plugin.initialize() for _, plugin in pending),
+            return_exceptions=True
+        )
+        
+        for (plugin_name, plugin), result in zip(pending, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to load plugin {plugin_name}: {str(result)}")
+                continue
+            self.plugins[plugin_name] = plugin
+            # Encode once here so plugins can return Paths, sets or models
+            self._plugin_info[plugin_name] = jsonable_encoder(plugin.get_info())
+            self._info_cache = None
+            logger.info(f"Loaded plugin: {plugin_name}")
     
     async def shutdown_plugins(self):
-        """Shutdown all loaded plugins."""
-        for plugin_name, plugin in self.plugins.items():
-            try:
-                await plugin.shutdown()
+        """Shutdown all loaded plugins concurrently."""
+        loaded = list(self.plugins.items())
+        results = await asyncio.gather(
+            *(plugin.shutdown() for _, plugin in loaded),
+            return_exceptions=True
+        )
+        
+        for (plugin_name, _), result in zip(loaded, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error shutting down plugin {plugin_name}: {str(result)}")
+            else:
                 logger.info(f"Shutdown plugin: {plugin_name}")
-            except Exception as e:
-                logger.error(f"Error shutting down plugin {plugin_name}: {str(e)}")
         
         self.plugins.clear()
+        self._plugin_info.clear()
+        self._info_cache = None
     
     def get_plugin(self, plugin_name: str) -> Plugin:
         """Get a plugin by name."""
@@ -72,6 +152,18 @@ class PluginManager:
             raise KeyError(f"Plugin {plugin_name} not found")
         return self.plugins[plugin_name]
     
-    def list_plugins(self) -> Dict[str, Plugin]:
-        """List all loaded plugins."""
-        return self.plugins.copy() 
\ No newline at end of file
+    def get_plugin_info(self, plugin_name: str) -> Dict[str, Any]:
+        """Get a plugin's info as captured when it was loaded."""
+        if plugin_name not in self._plugin_info:
+            raise KeyError(f"Plugin {plugin_name} not found")
+        return self._plugin_info[plugin_name]
+    
+    def list_plugins(self) -> Mapping[str, Plugin]:
+        """List all loaded plugins as a read-only view."""
+        return self._plugins_view
+    
+    def plugin_info_json(self) -> bytes:
+        """Get the info of all loaded plugins, as captured at load time, serialized as JSON."""
+        if self._info_cache is None:
+            self._info_cache = orjson.dumps(self._plugin_info)
+        return self._info_cache
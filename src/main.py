@@ -1,29 +1,34 @@
 import uvicorn
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from loguru import logger
-import yaml
 import os
 from pathlib import Path
 
 from core.plugin_manager import PluginManager
-from core.config import Settings
+from core.config import Settings, get_server_options, get_settings
 from api.routes import router as api_router
 
 # Initialize FastAPI app
 app = FastAPI(
     title="MCP Server",
     description="Master Control Program Server for macOS",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
-# Add CORS middleware
+# Add CORS middleware, allowing only the app's own webview on the configured port
+settings = get_settings()
+allowed_origins = list(dict.fromkeys(
+    f"http://{host}:{settings.port}" for host in (settings.host, "localhost", "127.0.0.1")
+))
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=allowed_origins,
+    allow_credentials=False,
+    allow_methods=["GET", "POST"],
+    allow_headers=["content-type"],
 )
 
 # Load configuration
@@ -31,14 +36,22 @@ def load_config():
     config_path = Path("config/config.yaml")
     if not config_path.exists():
         logger.warning("Config file not found, using default settings")
-        return Settings()
+        return get_settings()
     
+    import yaml
+    try:
+        from yaml import CSafeLoader as _Loader  # libyaml-backed
+    except ImportError:
+        from yaml import SafeLoader as _Loader
     with open(config_path) as f:
-        config_data = yaml.safe_load(f)
+        config_data = yaml.load(f, Loader=_Loader)
+    if not config_data:
+        return get_settings()
     return Settings(**config_data)
 
 # Initialize plugin manager
 plugin_manager = PluginManager()
+app.state.plugin_manager = plugin_manager
 
 @app.on_event("startup")
 async def startup_event():
@@ -70,8 +83,6 @@ app.include_router(api_router, prefix="/api")
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
-        host="localhost",
-        port=8080,
-        reload=True,
-        log_level="info"
+        reload=os.environ.get("MCP_DEV") == "1",  # File watcher only for development
+        **get_server_options()
     ) 
\ No newline at end of file
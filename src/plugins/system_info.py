@@ -1,6 +1,8 @@
+import asyncio
 import platform
-import psutil
-from typing import Dict, Any
+import time
+from typing import Awaitable, Callable, Dict, Any, Optional, Tuple
+from loguru import logger
 
 from core.plugin import Plugin, PluginCommand, PluginResponse
 
@@ -9,54 +11,102 @@ class SystemInfoPlugin(Plugin):
     
     def __init__(self):
         super().__init__("system_info")
+        self._cpu_percent: Optional[float] = None  # None until the first real sample
+        self._cpu_sampler: Optional[asyncio.Task] = None
+        self._static_info: Dict[str, Any] = {}
+        self._cache: Dict[str, Tuple[float, PluginResponse]] = {}
     
     async def initialize(self) -> None:
         """Initialize the plugin."""
+        self.register_command("get_system_info", self._get_system_info)
+        self.register_command("get_cpu_info", self._get_cpu_info)
+        self.register_command("get_memory_info", self._get_memory_info)
+        
+        # These can't change while the process runs, and some of them shell out,
+        # so collect them once off the event loop
+        self._static_info = await asyncio.to_thread(self._read_static_info)
         await super().initialize()
+        
+        # Start sampling last so a failed initialize never leaves the task running
+        self._cpu_sampler = asyncio.create_task(self._sample_cpu_percent())
     
     async def shutdown(self) -> None:
         """Shutdown the plugin."""
+        if self._cpu_sampler:
+            self._cpu_sampler.cancel()
+            self._cpu_sampler = None
         await super().shutdown()
     
+    @staticmethod
+    def _read_static_info() -> Dict[str, Any]:
+        """Read the platform details that stay fixed for the process lifetime."""
+        return {
+            "system": platform.system(),
+            "release": platform.release(),
+            "version": platform.version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "python_version": platform.python_version()
+        }
+    
+    async def _sample_cpu_percent(self) -> None:
+        """Keep a rolling CPU usage sample so requests never block on one."""
+        try:
+            import psutil
+            # The first reading only sets the baseline and is always 0.0
+            psutil.cpu_percent(None)
+        except Exception as e:
+            logger.error(f"CPU usage sampling unavailable: {str(e)}")
+            return
+        
+        while True:
+            await asyncio.sleep(1)
+            try:
+                self._cpu_percent = await asyncio.to_thread(psutil.cpu_percent, None)
+            except Exception as e:
+                logger.error(f"Failed to sample CPU usage: {str(e)}")
+    
     async def handle_command(self, command: PluginCommand) -> PluginResponse:
         """Handle system information commands."""
-        if command.command == "get_system_info":
-            return await self._get_system_info()
-        elif command.command == "get_cpu_info":
-            return await self._get_cpu_info()
-        elif command.command == "get_memory_info":
-            return await self._get_memory_info()
-        else:
-            return PluginResponse(
-                success=False,
-                error=f"Unknown command: {command.command}"
-            )
+        return await self.dispatch_command(command)
+    
+    async def _cached(
+        self,
+        key: str,
+        ttl: float,
+        fn: Callable[[], Awaitable[PluginResponse]]
+    ) -> PluginResponse:
+        """Return the response cached under key if younger than ttl seconds."""
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached is not None and now - cached[0] < ttl:
+            return cached[1]
+        
+        response = await fn()
+        if response.success:
+            self._cache[key] = (now, response)
+        return response
     
     async def _get_system_info(self) -> PluginResponse:
         """Get general system information."""
-        try:
-            info = {
-                "system": platform.system(),
-                "release": platform.release(),
-                "version": platform.version(),
-                "machine": platform.machine(),
-                "processor": platform.processor(),
-                "python_version": platform.python_version()
-            }
-            return PluginResponse(success=True, data=info)
-        except Exception as e:
-            return PluginResponse(success=False, error=str(e))
+        return PluginResponse(success=True, data=self._static_info)
     
     async def _get_cpu_info(self) -> PluginResponse:
-        """Get CPU information."""
+        """Get CPU information; cpu_percent is None until the first sample."""
+        return await self._cached("cpu_info", 0.1, self._read_cpu_info)
+    
+    async def _read_cpu_info(self) -> PluginResponse:
+        """Read CPU information from psutil."""
         try:
+            import psutil
+            freq = await asyncio.to_thread(psutil.cpu_freq)
             info = {
                 "cpu_count": psutil.cpu_count(),
-                "cpu_percent": psutil.cpu_percent(interval=1),
+                "cpu_percent": self._cpu_percent,
                 "cpu_freq": {
-                    "current": psutil.cpu_freq().current,
-                    "min": psutil.cpu_freq().min,
-                    "max": psutil.cpu_freq().max
+                    "current": freq.current,
+                    "min": freq.min,
+                    "max": freq.max
                 }
             }
             return PluginResponse(success=True, data=info)
@@ -65,8 +115,13 @@ class SystemInfoPlugin(Plugin):
     
     async def _get_memory_info(self) -> PluginResponse:
         """Get memory information."""
+        return await self._cached("memory_info", 0.1, self._read_memory_info)
+    
+    async def _read_memory_info(self) -> PluginResponse:
+        """Read memory information from psutil."""
         try:
-            memory = psutil.virtual_memory()
+            import psutil
+            memory = await asyncio.to_thread(psutil.virtual_memory)
             info = {
                 "total": memory.total,
                 "available": memory.available,
@@ -76,4 +131,6 @@ class SystemInfoPlugin(Plugin):
             }
             return PluginResponse(success=True, data=info)
         except Exception as e:
-            return PluginResponse(success=False, error=str(e)) 
\ No newline at end of file
+            return PluginResponse(success=False, error=str(e)) 
+
+PLUGIN_CLASS = SystemInfoPlugin
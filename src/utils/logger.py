@@ -1,9 +1,29 @@
+import inspect
 import logging
 import os
 import sys
 from pathlib import Path
 from datetime import datetime
 
+from loguru import logger
+
+class InterceptHandler(logging.Handler):
+    """Forward stdlib logging records to loguru."""
+    
+    def emit(self, record):
+        try:
+            level = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+        
+        # Report the caller that logged the message, not the logging module
+        frame, depth = inspect.currentframe(), 0
+        while frame and (depth == 0 or frame.f_code.co_filename == logging.__file__):
+            frame = frame.f_back
+            depth += 1
+        
+        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+
 def setup_logging():
     # Create logs directory if it doesn't exist
     log_dir = Path.home() / "Library" / "Logs" / "MCP"
@@ -13,18 +33,17 @@ def setup_logging():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_file = log_dir / f"mcp_{timestamp}.log"
     
-    # Configure logging
-    logging.basicConfig(
-        level=logging.DEBUG,  # Set to DEBUG to capture everything
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    # Configure logging: one loguru handler stack for launch.py and src/*,
+    # with file writes done from loguru's background queue
+    logger.remove()
+    logger.add(sys.stdout, level="INFO")
+    logger.add(log_file, level="DEBUG", enqueue=True, rotation="10 MB")
     
-    # Create a logger for this module
-    logger = logging.getLogger('MCP')
+    # uvicorn runs in-process but logs through stdlib logging; route it here too
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = [InterceptHandler()]
+        uvicorn_logger.propagate = False
     
     # Log system information
     logger.info("=== MCP Application Start ===")
@@ -35,5 +54,5 @@ def setup_logging():
     
     return logger
 
-# Create a global logger instance
-logger = setup_logging() 
\ No newline at end of file
+# Configure the shared logger on import; callers use `from utils.logger import logger`
+setup_logging()